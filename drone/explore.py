@@ -1,9 +1,11 @@
 import numpy as np
 import math
 from djitellopy import Tello
-from scipy.spatial.transform import Rotation as R
 import time
 
+# 4-connected neighbor offsets, in frontier priority order
+NEIGHBORS = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)])
+
 class TelloExplorer:
     def __init__(self, resolution=0.5, init_size=50):
         """
@@ -21,12 +23,13 @@ class TelloExplorer:
         self.occ     =  1
 
         # occupancy map and visited mask
-        self.occ_map = np.full((init_size, init_size), self.unknown, dtype=int)
+        self.occ_map = np.full((init_size, init_size), self.unknown, dtype=np.int8)
         self.visited = np.zeros_like(self.occ_map, dtype=bool)
 
         # origin index in the array corresponding to world (0,0)
         self.origin = (init_size // 2, init_size // 2)
         self.curr_idx = self.origin
+        self.ensure_in_map(*self.curr_idx)
         self.yaw = 0.0   # current heading in degrees
 
     def world_to_grid(self, x, y):
@@ -36,21 +39,31 @@ class TelloExplorer:
 
     def ensure_in_map(self, gx, gy):
         """
-        If (gx,gy) falls outside occ_map, pad both occ_map and visited.
+        If (gx,gy) or any of its neighbors falls outside occ_map, grow both
+        occ_map and visited, so the current cell always keeps a 1-cell border.
+        Each overflowing side grows by at least the current extent, so the
+        copy cost is amortized O(1) per step instead of a full copy each time.
         Adjust origin and curr_idx accordingly.
         """
         h, w = self.occ_map.shape
-        pad_top = max(0, -gx)
-        pad_bottom = max(0, gx - (h - 1))
-        pad_left = max(0, -gy)
-        pad_right = max(0, gy - (w - 1))
+        pad_top = max(0, 1 - gx)
+        pad_bottom = max(0, gx + 1 - (h - 1))
+        pad_left = max(0, 1 - gy)
+        pad_right = max(0, gy + 1 - (w - 1))
         if any((pad_top, pad_bottom, pad_left, pad_right)):
-            self.occ_map = np.pad(self.occ_map,
-                                  ((pad_top, pad_bottom), (pad_left, pad_right)),
-                                  constant_values=self.unknown)
-            self.visited = np.pad(self.visited,
-                                  ((pad_top, pad_bottom), (pad_left, pad_right)),
-                                  constant_values=False)
+            # geometric growth on every side that overflowed
+            pad_top    = max(pad_top, h)    if pad_top    else 0
+            pad_bottom = max(pad_bottom, h) if pad_bottom else 0
+            pad_left   = max(pad_left, w)   if pad_left   else 0
+            pad_right  = max(pad_right, w)  if pad_right  else 0
+            new_shape = (h + pad_top + pad_bottom, w + pad_left + pad_right)
+
+            occ_map = np.full(new_shape, self.unknown, dtype=self.occ_map.dtype)
+            occ_map[pad_top:pad_top + h, pad_left:pad_left + w] = self.occ_map
+            visited = np.zeros(new_shape, dtype=bool)
+            visited[pad_top:pad_top + h, pad_left:pad_left + w] = self.visited
+            self.occ_map, self.visited = occ_map, visited
+
             # shift origin and current index
             self.origin    = (self.origin[0] + pad_top,    self.origin[1] + pad_left)
             self.curr_idx  = (self.curr_idx[0] + pad_top,  self.curr_idx[1] + pad_left)
@@ -63,13 +76,14 @@ class TelloExplorer:
         - Updates self.yaw from quaternion
         """
         # 1) parse yaw from quaternion
-        r = R.from_quat(quat)               # quat = [qx, qy, qz, qw]
-        _, _, yaw_rad = r.as_euler('xyz')
+        qx, qy, qz, qw = quat               # quat = [qx, qy, qz, qw]
+        yaw_rad = math.atan2(2 * (qw * qz + qx * qy), 1 - 2 * (qy * qy + qz * qz))
         self.yaw = math.degrees(yaw_rad)
 
         # 2) grid index
         gx, gy = self.world_to_grid(x, y)
         self.ensure_in_map(gx, gy)
+        gx, gy = self.world_to_grid(x, y)   # origin may have shifted
         self.curr_idx = (gx, gy)
 
         # 3) mark free & visited
@@ -81,15 +95,10 @@ class TelloExplorer:
         Return list of neighbor indices (4‐connected) of current cell
         that are still unknown (occ_map = -1).
         """
-        front = []
-        x0, y0 = self.curr_idx
-        for dx, dy in [(-1,0),(1,0),(0,-1),(0,1)]:
-            nx, ny = x0 + dx, y0 + dy
-            # ensure in map before lookup
-            self.ensure_in_map(nx, ny)
-            if self.occ_map[nx, ny] == self.unknown:
-                front.append((nx, ny))
-        return front
+        # the 1-cell border kept by ensure_in_map makes every neighbor valid
+        cells = NEIGHBORS + self.curr_idx
+        unknown = self.occ_map[cells[:, 0], cells[:, 1]] == self.unknown
+        return [tuple(c) for c in cells[unknown].tolist()]
 
     def rotate_to(self, target_yaw):
         """
@@ -3,7 +3,7 @@ Minimal 3‑D matplotlib visualizer for camera poses (position + quaternion).
 
 • Each frame is drawn as:
     – a small colored dot (sequence‑specific color) at the XYZ position
-    – three short axis arrows showing the local +X (red), +Y (green), +Z (blue)
+    – three short axis segments showing the local +X (red), +Y (green), +Z (blue)
 
 • Two independent sequences are shown; feel free to add more.
 
@@ -18,6 +18,7 @@ Install extras if needed:
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D          # noqa: F401 (needed for 3‑D)
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 from scipy.spatial.transform import Rotation as R
 
 # ---------------------------------------------------------------------
@@ -59,20 +60,7 @@ ax: Axes3D = fig.add_subplot(111, projection="3d")
 ax.set_box_aspect([1, 1, 1])  # equal aspect ratio
 
 # ---------------------------------------------------------------------
-# ❸  Helper to draw one camera pose
-def draw_pose(origin: np.ndarray, rot: R, length: float = 0.05):
-    """Draw a right‑handed coordinate frame at `origin` using `rot` (Rotation)."""
-    axes = rot.apply(np.eye(3))  # world‑space directions of camera’s +X,+Y,+Z
-    colors = ["r", "g", "b"]
-    for vec, c in zip(axes, colors):
-        ax.quiver(
-            origin[0], origin[1], origin[2],     # tail
-            vec[0], vec[1], vec[2],              # direction
-            length=length, color=c, linewidth=1,
-        )
-
-# ---------------------------------------------------------------------
-# ❹  Plot every sequence
+# ❸  Plot every sequence
 for seq in sequences:
     xyz, quat, clr = seq["xyz"], seq["quat"], seq["color"]
 
@@ -81,12 +69,17 @@ for seq in sequences:
             marker="o", markersize=4, color=clr,
             label=seq["name"])
 
-    # Coordinate frames
-    for p, q in zip(xyz, quat):
-        draw_pose(p, R.from_quat(q))
+    # Coordinate frames: one line collection for all 3N axis segments of the
+    # sequence. Columns of each rotation matrix are the world‑space +X,+Y,+Z.
+    rots = R.from_quat(quat)
+    axes = rots.as_matrix().transpose(0, 2, 1).reshape(-1, 3)   # (3N, 3)
+    origins = np.repeat(xyz, 3, axis=0)
+    segs = np.stack([origins, origins + 0.05 * axes], axis=-2)  # (3N, 2, 3)
+    ax.add_collection3d(Line3DCollection(
+        segs, colors=["r", "g", "b"] * len(xyz), linewidths=1))
 
 # ---------------------------------------------------------------------
-# ❺  Cosmetics
+# ❹  Cosmetics
 ax.set_xlabel("X")
 ax.set_ylabel("Y")
 ax.set_zlabel("Z")
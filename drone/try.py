@@ -1,19 +1,16 @@
 from djitellopy import tello
-from time import sleep
 
 drone = tello.Tello()
 drone.connect()
 print(drone.get_battery())  # optional
 
+# Each command blocks until the drone acknowledges it, so no sleeps needed
 def doSomething():
     drone.takeoff()
-    sleep(1)
     drone.rotate_clockwise(90)
-    sleep(1)
     drone.land()
-    sleep(1)
 
 condition = 1 > 0
 
 if (condition):  # optional
-    doSomething()
\ No newline at end of file
+    doSomething()
@@ -1,6 +1,5 @@
+import asyncio
 import socket
-import threading
-import time
 
 # === Configure this: (drone_ip is always 192.168.10.1 in AP mode)
 # ('drone_ip', 'local_interface_ip', local_udp_port)
@@ -9,42 +8,69 @@ DRONES = [
     # ('192.168.10.1', '192.168.10.3', 9001),  # Internal Wi-Fi
 ]
 
+# === One connected command socket per drone, opened once and reused for
+# === every command; connect() also makes the kernel drop foreign datagrams
+def open_command_socket(drone_ip, local_ip, local_port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((local_ip, local_port))
+    sock.connect((drone_ip, 8889))
+    return sock
+
+# === Hands command responses from one drone to the waiting coroutine
+class TelloProtocol(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.pending = None
+
+    def datagram_received(self, data, addr):
+        if self.pending is None or self.pending.done():
+            return
+        # Tello firmware occasionally replies with non-UTF-8 bytes
+        try:
+            self.pending.set_result(data.decode('utf-8'))
+        except UnicodeDecodeError as e:
+            self.pending.set_exception(e)
+
+    def error_received(self, exc):
+        if self.pending is not None and not self.pending.done():
+            self.pending.set_exception(exc)
+
 # === Send command and wait for response
-def tello_command(sock, drone_ip, cmd):
+async def tello_command(transport, protocol, cmd, timeout=5):
+    protocol.pending = asyncio.get_running_loop().create_future()
     try:
-        sock.sendto(cmd.encode('utf-8'), (drone_ip, 8889))
-        response, _ = sock.recvfrom(1024)
-        return response.decode('utf-8')
-    except socket.timeout:
+        transport.sendto(cmd.encode('utf-8'))
+        return await asyncio.wait_for(protocol.pending, timeout)
+    except asyncio.TimeoutError:
         return "timeout"
     except Exception as e:
         return f"error: {e}"
 
 # === Control one drone
-def control_drone(drone_ip, local_ip, local_port):
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    sock.bind((local_ip, local_port))
-    sock.settimeout(5)
+async def control_drone(transport, protocol):
+    local_ip, local_port = transport.get_extra_info('sockname')
 
     print(f"[{local_ip}:{local_port}] → Sending 'command'")
-    print("↪", tello_command(sock, drone_ip, 'command'))
+    print("↪", await tello_command(transport, protocol, 'command'))
 
     print(f"[{local_ip}:{local_port}] → Asking 'battery?'")
-    print("↪", tello_command(sock, drone_ip, 'battery?'))
+    print("↪", await tello_command(transport, protocol, 'battery?'))
 
-    sock.close()
+# === Main runner: all drones share one event loop
+async def run_swarm(socks):
+    # Every drone answers from the same AP address, so each one keeps its own
+    # socket bound to the interface it is reached through.
+    loop = asyncio.get_running_loop()
+    endpoints = [await loop.create_datagram_endpoint(TelloProtocol, sock=sock) for sock in socks]
+    try:
+        await asyncio.gather(*(control_drone(t, p) for t, p in endpoints))
+    finally:
+        for transport, _ in endpoints:
+            transport.close()
 
-# === Main multithreaded runner
 def main():
-    threads = []
-    for drone_ip, local_ip, local_port in DRONES:
-        t = threading.Thread(target=control_drone, args=(drone_ip, local_ip, local_port))
-        t.start()
-        threads.append(t)
-
-    for t in threads:
-        t.join()
+    socks = [open_command_socket(*d) for d in DRONES]
+    asyncio.run(run_swarm(socks))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
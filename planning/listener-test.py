@@ -1,6 +1,5 @@
 import socket
 import threading
-import time
 
 TELLO_IP = '192.168.10.1'
 CMD_PORT = 8889
@@ -25,15 +24,20 @@ def listen_tello_state():
         sock.close()
         print("🛑 Closed state listener")
 
-# === Send a single command and wait for response ===
-def tello_command(cmd_sock, cmd):
-    cmd_sock.sendto(cmd.encode('utf-8'), (TELLO_IP, CMD_PORT))
+# === Block until the drone answers (or timeout) ===
+def wait_ack(cmd_sock, timeout=5):
+    cmd_sock.settimeout(timeout)
     try:
         resp, _ = cmd_sock.recvfrom(1024)
         return resp.decode('utf-8')
     except socket.timeout:
         return "timeout"
 
+# === Send a single command and wait for response ===
+def tello_command(cmd_sock, cmd, timeout=5):
+    cmd_sock.sendto(cmd.encode('utf-8'), (TELLO_IP, CMD_PORT))
+    return wait_ack(cmd_sock, timeout)
+
 def main():
 
     # === Create command socket ===
@@ -41,19 +45,13 @@ def main():
     cmd_sock.settimeout(5)
     cmd_sock.connect((TELLO_IP, CMD_PORT))
 
-    time.sleep(2)  # Give time for everything to stabilize
-
     # === Enter SDK mode ===
     print("→ Sending 'command'...")
     print("↪", tello_command(cmd_sock, 'command'))
 
-    time.sleep(2)
-
     # Start telemetry listener in background
     listener = threading.Thread(target=listen_tello_state)
     listener.start()
-    
-    time.sleep(2)
 
     # === Ask for battery ===
     print("→ Sending 'battery?'...")
@@ -1,14 +1,21 @@
 from djitellopy import Tello
-import time
+import threading
 
 interface_names = [b"eth1", b"eth2"]
 tello_ip = ["192.168.10.1", "192.168.10.3"]
 
-for i in range(2):
-    drone = Tello(host=tello_ip[i])
+# Commands block until acknowledged, so each flight needs no sleeps
+def fly(drone):
     drone.connect()
-    time.sleep(2)
     drone.takeoff()
-    time.sleep(2)
     drone.land()
-    print("✅ Done.")
\ No newline at end of file
+    print("✅ Done.")
+
+# Create drones up front (Tello() sets up shared sockets on first use),
+# then fly them concurrently
+drones = [Tello(host=ip) for ip in tello_ip]
+threads = [threading.Thread(target=fly, args=(drone,)) for drone in drones]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
@@ -1,24 +1,49 @@
 #!/usr/bin/env python3
 import time
 import os
+import csv
 import logging
+import queue
+import threading
 import cv2
 from djitellopy import Tello
 
-def parse_key_values(s: str) -> dict:
+# Column order of imu.csv
+IMU_FIELDS = [
+    'timestamp', 'battery', 'height_cm', 'flight_time_s',
+    'speed_x', 'speed_y', 'speed_z', 'pitch', 'roll', 'yaw',
+    'acc_x', 'acc_y', 'acc_z', 'barometer_cm', 'tof_cm',
+    'temperature_C', 'wifi_snr',
+]
+IMU_FLUSH_EVERY = 10  # rows between explicit flushes
+
+# ——— Image writer thread ———
+def start_image_writer(maxsize=4):
     """
-    Parse a semicolon-separated 'key:val;key:val;...' string into a dict of floats.
+    Encode and save frames on a worker thread so PNG compression and disk
+    I/O overlap with the next capture. Put (path, rgb_frame) on the returned
+    queue; put None to stop.
     """
-    out = {}
-    for part in s.strip().split(';'):
-        if ':' not in part:
-            continue
-        k, v = part.split(':', 1)
-        try:
-            out[k] = float(v)
-        except ValueError:
-            out[k] = None
-    return out
+    q = queue.Queue(maxsize=maxsize)
+
+    def loop():
+        while True:
+            item = q.get()
+            if item is None:
+                break
+            path, rgb = item
+            # Never let one bad frame kill the thread: the bounded queue would
+            # fill and block the capture loop (and shutdown) forever
+            try:
+                # djitellopy frames are RGB; imwrite expects BGR
+                bgr = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+                cv2.imwrite(path, bgr, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+            except Exception as e:
+                print(f"⚠️ Could not save {path}: {e}")
+
+    thread = threading.Thread(target=loop)
+    thread.start()
+    return q, thread
 
 def main():
     # ——— 1) Connect & stream ———
@@ -32,55 +57,55 @@ def main():
 
     # ——— 2) Prepare directories & timestamp log ———
     os.makedirs('images', exist_ok=True)
-    os.makedirs('imu', exist_ok=True)
-    ts_log = open('timestep.txt', 'w')
+    ts_log = open('timestep.txt', 'w', buffering=1 << 16)
+    imu_file = open('imu.csv', 'w', newline='')
+    imu_writer = csv.DictWriter(imu_file, fieldnames=IMU_FIELDS)
+    imu_writer.writeheader()
+    img_queue, img_writer = start_image_writer()
 
     print("Collecting data every 1 s. Ctrl+C to stop.")
 
     try:
+        n = 0
+        period = 1.0
+        next_tick = time.monotonic()
         while True:
             ts = time.time()
 
-            # ——— 3) Capture frame, convert BGR→RGB, save ———
-            bgr = frame_reader.frame
-            rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
-            img_path = os.path.join('images', f"{int(ts)}.png")
-            cv2.imwrite(img_path, rgb)
+            # ——— 3) Capture frame, hand off to the writer thread ———
+            img_path = os.path.join('images', f"{int(ts * 1000)}.png")
+            img_queue.put((img_path, frame_reader.frame))
 
             # ——— 4) Gather telemetry ———
+            # One snapshot of the latest 8890 state packet (already received
+            # and parsed by djitellopy's background listener) — no round-trips.
+            state = tello.get_current_state()
+            templ, temph = state.get('templ'), state.get('temph')
+
             data = {}
             data['timestamp']      = ts
-            data['battery']        = tello.get_battery()
-            data['height_cm']      = tello.get_height()
-            data['flight_time_s']  = tello.get_flight_time()
-            data['speed_x']        = tello.get_speed_x()
-            data['speed_y']        = tello.get_speed_y()
-            data['speed_z']        = tello.get_speed_z()
-
-            # Attitude: parse "pitch:-3;roll:0;yaw:122;"
-            try:
-                att_str = tello.send_read_command('attitude?')
-                att = parse_key_values(att_str)
-            except Exception:
-                att = {}
-            data['pitch'] = att.get('pitch')
-            data['roll']  = att.get('roll')
-            data['yaw']   = att.get('yaw')
+            data['battery']        = state.get('bat')
+            data['height_cm']      = state.get('h')
+            data['flight_time_s']  = state.get('time')
+            data['speed_x']        = state.get('vgx')
+            data['speed_y']        = state.get('vgy')
+            data['speed_z']        = state.get('vgz')
+
+            # Attitude
+            data['pitch'] = state.get('pitch')
+            data['roll']  = state.get('roll')
+            data['yaw']   = state.get('yaw')
 
             # Acceleration from onboard IMU
-            data['acc_x'] = tello.get_acceleration_x()
-            data['acc_y'] = tello.get_acceleration_y()
-            data['acc_z'] = tello.get_acceleration_z()
+            data['acc_x'] = state.get('agx')
+            data['acc_y'] = state.get('agy')
+            data['acc_z'] = state.get('agz')
 
-            # Barometer: parse e.g. "-50.087814"
-            try:
-                baro = tello.send_read_command('baro?')
-                data['barometer_cm'] = float(baro)
-            except Exception:
-                data['barometer_cm'] = None
+            # Barometer: raw value, same as the old 'baro?' reply
+            data['barometer_cm'] = state.get('baro')
 
-            data['tof_cm']       = tello.get_distance_tof()
-            data['temperature_C']= tello.get_temperature()
+            data['tof_cm']       = state.get('tof')
+            data['temperature_C']= (templ + temph) / 2 if None not in (templ, temph) else None
 
             # Wi‑Fi SNR: parse "wifi?-?" 
             try:
@@ -89,20 +114,27 @@ def main():
             except Exception:
                 data['wifi_snr'] = None
 
-            # ——— 5) Write one IMU text file per timestamp ———
-            imu_path = os.path.join('imu', f"{int(ts)}.txt")
-            with open(imu_path, 'w') as f:
-                for k, v in data.items():
-                    f.write(f"{k}: {v}\n")
+            # ——— 5) Append one IMU row ———
+            imu_writer.writerow(data)
+            n += 1
+            if n % IMU_FLUSH_EVERY == 0:
+                imu_file.flush()
 
-            # ——— 6) Log timestamp and wait ———
+            # ——— 6) Log timestamp and wait for the next tick ———
             ts_log.write(f"{ts}\n")
-            ts_log.flush()
-            time.sleep(1)
+            next_tick += period
+            dt = next_tick - time.monotonic()
+            if dt > 0:
+                time.sleep(dt)
+            else:
+                next_tick = time.monotonic()  # fell behind; resync
 
     except KeyboardInterrupt:
         print("\n✔ Stopped by user")
     finally:
+        img_queue.put(None)
+        img_writer.join()
+        imu_file.close()
         ts_log.close()
         tello.streamoff()
         tello.end()
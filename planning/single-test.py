@@ -1,9 +1,6 @@
 from djitellopy import Tello
-import time
 
 drone = Tello()
 drone.connect()
-time.sleep(2)
 drone.takeoff()
-time.sleep(2)
-drone.land()
\ No newline at end of file
+drone.land()
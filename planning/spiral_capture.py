@@ -1,75 +1,137 @@
 #!/usr/bin/env python3
 import time
-import os
+import csv
+import re
 import logging
 import threading
+import queue
 import cv2
 import numpy as np
 from djitellopy import Tello
 
-# ——— Utility ———
-def parse_key_values(s: str) -> dict:
-    out = {}
-    for part in s.strip().split(';'):
-        if ':' not in part:
-            continue
-        k, v = part.split(':', 1)
-        try:
-            out[k] = float(v)
-        except ValueError:
-            out[k] = None
-    return out
+# Column order of imu.csv
+IMU_FIELDS = [
+    'timestamp', 'frame', 'battery', 'height_cm', 'flight_time_s',
+    'speed_x', 'speed_y', 'speed_z', 'pitch', 'roll', 'yaw',
+    'acc_x', 'acc_y', 'acc_z', 'barometer_cm', 'tof_cm',
+    'temperature_C', 'wifi_snr',
+]
+IMU_FLUSH_EVERY = 50  # rows between explicit flushes
 
-# ——— Logging Thread ———
-def start_data_collection(tello, frame_reader):
-    os.makedirs('images', exist_ok=True)
-    os.makedirs('imu', exist_ok=True)
-    ts_log = open('timestep.txt', 'w')
+# ——— Utility ———
+# The value must run up to ';', whitespace or end, so malformed values such
+# as 'roll:1e3' or 'mpry:0,0,0' are dropped rather than misread as a prefix
+_KV_PAT = re.compile(rb'(\w+):(-?\d+(?:\.\d*)?)(?=;|\s|$)')
+
+def parse_key_values(s) -> dict:
+    """
+    Parse a 'key:val;key:val;...' telemetry string (str or bytes) into a dict
+    of floats. Fields whose value is not numeric are skipped.
+    """
+    if isinstance(s, str):
+        s = s.encode()
+    return {k.decode(): float(v) for k, v in _KV_PAT.findall(s)}
+
+# ——— Video writer thread ———
+def start_video_writer(path='run.avi', fps=10, maxsize=4):
+    """
+    Append frames to a single MJPG video on a worker thread, so JPEG encoding
+    and disk I/O overlap with the next capture. Put rgb frames on the
+    returned queue; put None to stop. Frame i matches row i of imu.csv.
+    """
+    q = queue.Queue(maxsize=maxsize)
 
     def loop():
-        while logging_active[0]:
-            ts = time.time()
-            bgr = frame_reader.frame
-            rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
-            cv2.imwrite(os.path.join('images', f"{int(ts * 1000)}.png"), rgb)
-
-            data = {
-                'timestamp': ts,
-                'battery': tello.get_battery(),
-                'height_cm': tello.get_height(),
-                'flight_time_s': tello.get_flight_time(),
-                'speed_x': tello.get_speed_x(),
-                'speed_y': tello.get_speed_y(),
-                'speed_z': tello.get_speed_z(),
-                'acc_x': tello.get_acceleration_x(),
-                'acc_y': tello.get_acceleration_y(),
-                'acc_z': tello.get_acceleration_z(),
-                'tof_cm': tello.get_distance_tof(),
-                'temperature_C': tello.get_temperature(),
-            }
-
-            try:
-                att = parse_key_values(tello.send_read_command('attitude?'))
-                data.update({k: att.get(k) for k in ['pitch', 'roll', 'yaw']})
-            except: pass
-
-            try:
-                data['barometer_cm'] = float(tello.send_read_command('baro?'))
-            except: data['barometer_cm'] = None
-
+        vw = None
+        while True:
+            rgb = q.get()
+            if rgb is None:
+                break
+            # Never let one bad frame kill the thread: the bounded queue would
+            # fill and block the capture loop (and shutdown) forever
             try:
-                data['wifi_snr'] = float(tello.send_read_command('wifi?'))
-            except: data['wifi_snr'] = None
+                if vw is None:
+                    h, w = rgb.shape[:2]
+                    vw = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, (w, h))
+                    if not vw.isOpened():
+                        print(f"⚠️ Could not open video writer for {path}; frames will not be saved")
+                if not vw.isOpened():
+                    continue  # keep draining so the capture loop never blocks
+                # djitellopy frames are RGB; VideoWriter expects BGR
+                vw.write(cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR))
+            except Exception as e:
+                print(f"⚠️ Could not write video frame: {e}")
+        if vw is not None:
+            vw.release()
 
-            with open(os.path.join('imu', f"{int(ts * 1000)}.txt"), 'w') as f:
-                for k, v in data.items():
-                    f.write(f"{k}: {v}\n")
+    thread = threading.Thread(target=loop)
+    thread.start()
+    return q, thread
 
-            ts_log.write(f"{ts}\n")
-            ts_log.flush()
-            time.sleep(0.1)  # 10Hz
+# ——— Logging Thread ———
+def start_data_collection(tello, frame_reader):
+    ts_log = open('timestep.txt', 'w', buffering=1 << 16)
+    imu_file = open('imu.csv', 'w', newline='')
+    imu_writer = csv.DictWriter(imu_file, fieldnames=IMU_FIELDS)
+    imu_writer.writeheader()
+    vid_queue, vid_writer = start_video_writer()
 
-        ts_log.close()
+    def loop():
+        n = 0
+        period = 0.1  # 10Hz
+        next_tick = time.monotonic()
+        try:
+            while logging_active[0]:
+                ts = time.time()
+                vid_queue.put(frame_reader.frame)
+
+                data = {
+                    'timestamp': ts,
+                    'frame': n,
+                    'battery': tello.get_battery(),
+                    'height_cm': tello.get_height(),
+                    'flight_time_s': tello.get_flight_time(),
+                    'speed_x': tello.get_speed_x(),
+                    'speed_y': tello.get_speed_y(),
+                    'speed_z': tello.get_speed_z(),
+                    'acc_x': tello.get_acceleration_x(),
+                    'acc_y': tello.get_acceleration_y(),
+                    'acc_z': tello.get_acceleration_z(),
+                    'tof_cm': tello.get_distance_tof(),
+                    'temperature_C': tello.get_temperature(),
+                }
+
+                try:
+                    att = parse_key_values(tello.send_read_command('attitude?'))
+                    data.update({k: att.get(k) for k in ['pitch', 'roll', 'yaw']})
+                except: pass
+
+                try:
+                    data['barometer_cm'] = float(tello.send_read_command('baro?'))
+                except: data['barometer_cm'] = None
+
+                try:
+                    data['wifi_snr'] = float(tello.send_read_command('wifi?'))
+                except: data['wifi_snr'] = None
+
+                imu_writer.writerow(data)
+                n += 1
+                if n % IMU_FLUSH_EVERY == 0:
+                    imu_file.flush()
+
+                ts_log.write(f"{ts}\n")
+                next_tick += period
+                dt = next_tick - time.monotonic()
+                if dt > 0:
+                    time.sleep(dt)
+                else:
+                    next_tick = time.monotonic()  # fell behind; resync
+        finally:
+            # Always finalize run.avi and the logs, even if telemetry raised
+            vid_queue.put(None)
+            vid_writer.join()
+            imu_file.close()
+            ts_log.close()
 
     thread = threading.Thread(target=loop)
     thread.start()
@@ -89,26 +151,28 @@ def main():
     print("📸 Starting data collection thread")
     thread = start_data_collection(tello, frame_reader)
 
-    print("🛫 Taking off...")
-    tello.takeoff()
-    time.sleep(1)
-
-    print("🔁 Moving forward while spinning (spiral path)")
-    # Spiral: 10x (10 cm forward + 36° turn) = 100cm forward + 360°
-    for _ in range(10):
-        tello.move_forward(10)
+    try:
+        print("🛫 Taking off...")
+        tello.takeoff()
         time.sleep(1)
-        tello.rotate_clockwise(36)
-        time.sleep(1)
-
-    print("🛬 Landing")
-    tello.land()
 
-    logging_active[0] = False
-    thread.join()
-    tello.streamoff()
-    tello.end()
-    cv2.destroyAllWindows()
+        print("🔁 Moving forward while spinning (spiral path)")
+        # Spiral: 10x (10 cm forward + 36° turn) = 100cm forward + 360°
+        for _ in range(10):
+            tello.move_forward(10)
+            time.sleep(1)
+            tello.rotate_clockwise(36)
+            time.sleep(1)
+
+        print("🛬 Landing")
+        tello.land()
+    finally:
+        # Stop logging even if a flight command failed, so run.avi is finalized
+        logging_active[0] = False
+        thread.join()
+        tello.streamoff()
+        tello.end()
+        cv2.destroyAllWindows()
 
 # Shared state flag for logging loop
 logging_active = [True]
@@ -8,7 +8,7 @@ Two‑scene VGGT → depth‑map → GLB demo (no uploads, no Open3D).
 """
 
 import logging, time, tempfile
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 import gradio as gr
 import numpy as np
@@ -18,7 +18,6 @@ from visual_util import predictions_to_glb
 from vggt.models.vggt import VGGT
 from vggt.utils.load_fn import load_and_preprocess_images
 from vggt.utils.pose_enc import pose_encoding_to_extri_intri
-from vggt.utils.geometry import unproject_depth_map_to_point_map
 
 # ---------------------------------------------------------------------#
 # 1.  Static input frames
@@ -52,26 +51,108 @@ LOG = logging.getLogger("vggt‑dual‑demo")
 LOG.info("Loading VGGT weights …")
 model = VGGT.from_pretrained("facebook/VGGT-1B").to(device).eval()
 
+# Host→device image copies run on their own stream so they overlap compute
+copy_stream = torch.cuda.Stream() if device == "cuda" else None
+
+# The input sets are fixed: decode + preprocess them once, not per click,
+# and keep them in pinned host memory ready for async upload
+LOG.info("Preprocessing input frames …")
+IMAGES1 = load_and_preprocess_images(IMAGE_NAMES)
+IMAGES2 = load_and_preprocess_images(IMAGE2_NAMES)
+if device == "cuda":
+    IMAGES1, IMAGES2 = IMAGES1.pin_memory(), IMAGES2.pin_memory()
+
+# ---------------------------------------------------------------------#
+# 3.  Helper – async upload of one image set
+# ---------------------------------------------------------------------#
+def _upload(imgs: torch.Tensor) -> Tuple[torch.Tensor, Optional[torch.cuda.Event]]:
+    """
+    Start copying a preprocessed [S,3,H,W] image batch to `device`
+    (pinning it first unless it already is).
+    Returns the device tensor [1,S,3,H,W] and an event that fires once
+    the copy is done (None on CPU, where the copy is synchronous).
+    """
+    if copy_stream is None:
+        return imgs.to(device)[None], None
+
+    with torch.cuda.stream(copy_stream):
+        imgs_dev = imgs.pin_memory().to(device, non_blocking=True)[None]
+        ready = torch.cuda.Event()
+        ready.record(copy_stream)
+    return imgs_dev, ready
+
+# ---------------------------------------------------------------------#
+# 4.  Helper – batched device→host transfer
 # ---------------------------------------------------------------------#
-# 3.  Helper – run one sequence → (glb_path, depth_png)
+def _to_host(*tensors: torch.Tensor) -> List[np.ndarray]:
+    """
+    Copy device tensors to host as numpy arrays (dtype unchanged) with a
+    single stream synchronisation instead of one per tensor.
+    """
+    host = [t.to("cpu", non_blocking=True) for t in tensors]
+    if device == "cuda":
+        torch.cuda.current_stream().synchronize()
+    return [t.numpy() for t in host]
+
+# ---------------------------------------------------------------------#
+# 5.  Helper – on-device depth un-projection
+# ---------------------------------------------------------------------#
+@torch.inference_mode()
+def _unproject_on_device(
+    depth_map: torch.Tensor, extrinsic: torch.Tensor, intrinsic: torch.Tensor
+) -> torch.Tensor:
+    """
+    Device-side equivalent of `unproject_depth_map_to_point_map`.
+    depth_map [S,H,W,1], extrinsic [S,3,4] (cam from world), intrinsic [S,3,3]
+    → world points [S,H,W,3] (float32, same device).
+    """
+    H, W = depth_map.shape[1:3]
+    depth = depth_map[..., 0].float()
+    v, u = torch.meshgrid(
+        torch.arange(H, device=depth.device, dtype=torch.float32),
+        torch.arange(W, device=depth.device, dtype=torch.float32),
+        indexing="ij",
+    )
+
+    # camera coords: depth · ((u − cu)/fu, (v − cv)/fv, 1). Zero-skew K, so no
+    # matrix inverse (torch.linalg.inv would force a host sync on CUDA).
+    K = intrinsic.float()
+    fu, fv = K[:, 0, 0, None, None], K[:, 1, 1, None, None]
+    cu, cv = K[:, 0, 2, None, None], K[:, 1, 2, None, None]
+    cam_pts = torch.stack(
+        ((u - cu) / fu * depth, (v - cv) / fv * depth, depth), dim=-1
+    )  # [S,H,W,3]
+
+    # world coords: Rᵀ (x_cam − t)
+    R, t = extrinsic[..., :3].float(), extrinsic[..., 3].float()
+    return torch.einsum("sji,shwj->shwi", R, cam_pts - t[:, None, None, :])
+
+# ---------------------------------------------------------------------#
+# 6.  Helper – run one sequence → (glb_path, depth_png, pose_enc)
 # ---------------------------------------------------------------------#
 @torch.inference_mode()
 def _process_sequence(
-    img_paths: List[str],
+    host_imgs: torch.Tensor,
+    imgs: torch.Tensor,
+    ready: Optional[torch.cuda.Event],
     progress: gr.Progress,
     p0: float,
     p1: float,
     label: str,
-) -> Tuple[str, np.ndarray]:
+) -> Tuple[str, np.ndarray, np.ndarray]:
     """
-    Reconstruct a single set of images.
+    Reconstruct a single set of images: `host_imgs` is the preprocessed
+    [S,3,H,W] host batch, `imgs`/`ready` its upload from `_upload`.
     Map overall progress [p0,p1].
     """
     span = p1 - p0
     step = lambda frac, desc: progress(p0 + frac * span, desc=f"{label}: {desc}")
 
-    step(0.0, "loading images")
-    imgs = load_and_preprocess_images(img_paths).to(device)[None]  # [1,S,3,H,W]
+    step(0.0, "waiting for images")
+    if ready is not None:
+        compute_stream = torch.cuda.current_stream()
+        compute_stream.wait_event(ready)
+        imgs.record_stream(compute_stream)
     S = imgs.shape[1]             
     H = imgs.shape[-2]          
     W = imgs.shape[-1]          
@@ -87,22 +168,34 @@ def _process_sequence(
         step(0.55, "depth head")
         depth_map, depth_conf = model.depth_head(tokens, imgs, ps_idx)
 
-    # ---- numpy conversion -------------------------------------------------
-    extrinsic = extrinsic.cpu().to(torch.float32).numpy().squeeze(0)
-    intrinsic = intrinsic.cpu().to(torch.float32).numpy().squeeze(0)
-    depth_map = depth_map.cpu().to(torch.float32).numpy().squeeze(0)
-    depth_conf = depth_conf.cpu().to(torch.float32).numpy().squeeze(0)
-    
-    # Convert images to numpy for the predictions dict
-    images_np = imgs.squeeze(0).cpu().permute(0, 2, 3, 1).to(torch.float32).numpy()  # [S,H,W,3]
+    # Depth preview for frame‑0, normalised on device → only uint8 crosses PCIe
+    dm = depth_map[0, 0, ..., 0].float()
+    dm_norm = (dm - dm.min()) / (dm.max() - dm.min() + 1e-9)
+    depth_png = (dm_norm * 255).to(torch.uint8)
 
     step(0.72, "un‑project depth")
-    world_pts = unproject_depth_map_to_point_map(depth_map, extrinsic, intrinsic)
+    world_pts = _unproject_on_device(depth_map.squeeze(0), extrinsic.squeeze(0), intrinsic.squeeze(0))
+
+    # ---- numpy conversion -------------------------------------------------
+    # Queue every device→host copy, then synchronize once. Cameras stay fp32
+    # (tiny, and inverted downstream); points travel as fp16.
+    # depth_conf stays fp32: its 1+exp activation can exceed the fp16 range.
+    # The raw depth map itself is not needed on the host any more.
+    extrinsic, intrinsic, pose_enc, depth_conf, world_pts, depth_png = _to_host(
+        extrinsic.squeeze(0).float(),
+        intrinsic.squeeze(0).float(),
+        pose_enc.squeeze(0).float(),
+        depth_conf.squeeze(0).float(),
+        world_pts.half(),
+        depth_png,
+    )
+
+    # Colours come from the host batch we uploaded, not back from the GPU
+    images_np = host_imgs.permute(0, 2, 3, 1).numpy()  # [S,H,W,3] fp32
 
     preds = dict(
-        depth=depth_map,
         depth_conf=depth_conf,
-        pose_enc=pose_enc.cpu().to(torch.float32).numpy().squeeze(0),
+        pose_enc=pose_enc,
         extrinsic=extrinsic,
         intrinsic=intrinsic,
         world_points_from_depth=world_pts,
@@ -125,50 +218,35 @@ def _process_sequence(
         glb_path = tmp.name
     scene.export(glb_path)
 
-    dm = depth_map[0, ..., 0]
-    dm_norm = (dm - dm.min()) / (dm.max() - dm.min() + 1e-9)
-    depth_png = (dm_norm * 255).astype(np.uint8)
-
     step(1.0, "done")
-    return glb_path, depth_png
+    return glb_path, depth_png, pose_enc
 
 # ---------------------------------------------------------------------#
-# 4.  Top‑level reconstruction (handles two sequences)
+# 7.  Top‑level reconstruction (handles two sequences)
 # ---------------------------------------------------------------------#
+def _print_poses(title: str, pose_info: np.ndarray):
+    print(f"=== Pose information for {title} ===")
+    for i, pose in enumerate(pose_info):
+        print(f"Frame {i}: Position XYZ: {pose[0:3]}, Quaternion XYZW: {pose[3:7]}, FOV: {pose[7:9]}")
+
 def run_both(progress: gr.Progress = gr.Progress(track_tqdm=False)):
     t0 = time.time()
-    
-    # Process first sequence
-    glb1, depth1 = _process_sequence(IMAGE_NAMES, progress, 0.0, 0.5, "Set‑1")
-    
-    # Extract and print pose information for first sequence
-    with torch.inference_mode():
-        imgs1 = load_and_preprocess_images(IMAGE_NAMES).to(device)[None]
-        tokens1, ps_idx1 = model.aggregator(imgs1)
-        pose_enc1 = model.camera_head(tokens1)[-1]
-        pose_info1 = pose_enc1.cpu().to(torch.float32).numpy().squeeze(0)
-        print("=== Pose information for sequence 1 ===")
-        for i, pose in enumerate(pose_info1):
-            print(f"Frame {i}: Position XYZ: {pose[0:3]}, Quaternion XYZW: {pose[3:7]}, FOV: {pose[7:9]}")
-    
-    # Process second sequence
-    glb2, depth2 = _process_sequence(IMAGE2_NAMES, progress, 0.5, 1.0, "Set‑2")
-    
-    # Extract and print pose information for second sequence
-    with torch.inference_mode():
-        imgs2 = load_and_preprocess_images(IMAGE2_NAMES).to(device)[None]
-        tokens2, ps_idx2 = model.aggregator(imgs2)
-        pose_enc2 = model.camera_head(tokens2)[-1]
-        pose_info2 = pose_enc2.cpu().to(torch.float32).numpy().squeeze(0)
-        print("=== Pose information for sequence 2 ===")
-        for i, pose in enumerate(pose_info2):
-            print(f"Frame {i}: Position XYZ: {pose[0:3]}, Quaternion XYZW: {pose[3:7]}, FOV: {pose[7:9]}")
-    
+
+    # Queue both uploads up front: Set‑2's copy overlaps Set‑1's compute
+    imgs1, ready1 = _upload(IMAGES1)
+    imgs2, ready2 = _upload(IMAGES2)
+
+    glb1, depth1, pose_info1 = _process_sequence(IMAGES1, imgs1, ready1, progress, 0.0, 0.5, "Set‑1")
+    _print_poses("sequence 1", pose_info1)
+
+    glb2, depth2, pose_info2 = _process_sequence(IMAGES2, imgs2, ready2, progress, 0.5, 1.0, "Set‑2")
+    _print_poses("sequence 2", pose_info2)
+
     gr.Info(f"✓ Finished both in {time.time() - t0:.1f}s")
     return glb1, depth1, glb2, depth2
 
 # ---------------------------------------------------------------------#
-# 5.  Gradio UI
+# 8.  Gradio UI
 # ---------------------------------------------------------------------#
 with gr.Blocks(title="VGGT – two sequences") as demo:
     gr.Markdown(